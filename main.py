@@ -1,98 +1,335 @@
 import os
 import sys
 import zipfile
-import xml.etree.ElementTree as ET
+import re
+import mmap
+import itertools
+import struct
 import copy
+import contextlib
+import concurrent.futures
+import multiprocessing
 
-from PyQt5 import QtWidgets, QtCore
+from lxml import etree as ET
 
-def extract_hwpx_xml(file_path):
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+try:
+    # libdeflate 바인딩(선택 사항). 설치되어 있으면 구간 XML 압축에 사용합니다.
+    import deflate
+except ImportError:
+    deflate = None
+
+try:
+    # Hyperscan 바인딩(선택 사항). 설치되어 있으면 분리 기준 검색에 사용합니다.
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# 구간 XML을 저장할 때 사용하는 deflate 압축 수준 (zlib 기본값 6, '빠른 압축' 선택 시 3)
+DEFAULT_COMPRESSLEVEL = 6
+FAST_COMPRESSLEVEL = 3
+
+# 출력 HWPX 파일 쓰기 버퍼 크기 (작은 write 호출을 모아서 기록)
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# 로그 창 갱신 간격(ms). 이 간격 동안 쌓인 메시지를 한 번에 표시합니다.
+LOG_FLUSH_INTERVAL_MS = 50
+
+# 원본 구성 파일(이미지, 폰트 등)을 복사할 때 한 번에 기록하는 크기
+COPY_CHUNK_SIZE = 1 << 17
+
+# 구간 XML 전체 크기가 이보다 작으면 프로세스 풀 없이 현재 스레드에서 저장합니다.
+PARALLEL_MIN_XML_SIZE = 8 << 20
+
+@contextlib.contextmanager
+def open_hwpx_xml(file_path):
+    """
+    HWPX/hwtx 파일(ZIP)에서 주 내용 XML 파일('Contents/section0.xml')을 열어
+    (파일 객체, xml_path)를 돌려줍니다. 트리를 미리 만들지 않으므로 스트리밍 파싱에 사용합니다.
+    """
+    xml_path = 'Contents/section0.xml'
+    with zipfile.ZipFile(file_path, 'r') as z:
+        if xml_path not in z.namelist():
+            raise FileNotFoundError(f"'{xml_path}' 파일을 찾을 수 없습니다. 파일 구조를 확인해주세요.")
+        with z.open(xml_path) as f:
+            yield f, xml_path
+
+def read_root_element(xml_file):
+    """
+    XML의 루트 요소(시작 태그의 태그, 속성, 네임스페이스)만 읽어 반환합니다.
+    문서 전체를 파싱하지 않고 첫 start 이벤트에서 바로 멈춥니다.
+    """
+    for _, root in ET.iterparse(xml_file, events=('start',), huge_tree=True, collect_ids=False):
+        return root
+    raise ValueError("XML 루트 요소를 찾을 수 없습니다.")
+
+def iter_pages(xml_file):
+    """
+    XML을 iterparse로 읽으면서 루트의 직계 자식 요소(페이지)가 닫힐 때마다 해당 요소를 돌려줍니다.
+    루트 요소는 page.getparent()로 얻을 수 있습니다.
+    """
+    root = None
+    for _, elem in ET.iterparse(xml_file, events=('end',), huge_tree=True, collect_ids=False):
+        if root is None:
+            # 첫 end 이벤트(가장 먼저 닫히는 요소)에서 루트를 찾아 둡니다.
+            root = elem
+            while root.getparent() is not None:
+                root = root.getparent()
+        if elem.getparent() is root:
+            yield elem
+
+def page_text_bytes(page):
+    """페이지(요소)의 전체 텍스트를 lxml이 C 수준에서 직렬화한 UTF-8 bytes로 반환합니다."""
+    return ET.tostring(page, method='text', encoding='utf-8', with_tail=False)
+
+def compile_hyperscan_template(template_bytes):
     """
-    HWPX/hwtx 파일은 ZIP 압축 파일 형식입니다.
-    여기서는 주 내용이 저장된 XML 파일(예: 'Contents/section0.xml')을 파싱하여 XML 트리를 반환합니다.
+    template_bytes를 리터럴로 검색하는 Hyperscan 데이터베이스를 만들어 반환합니다.
+    Hyperscan이 없거나 컴파일할 수 없으면(빈 문자열 등) None을 반환합니다.
     """
+    if hyperscan is None or not template_bytes:
+        return None
     try:
-        with zipfile.ZipFile(file_path, 'r') as z:
-            xml_path = 'Contents/section0.xml'
-            if xml_path in z.namelist():
-                with z.open(xml_path) as f:
-                    tree = ET.parse(f)
-                return tree, xml_path
-            else:
-                raise FileNotFoundError(f"'{xml_path}' 파일을 찾을 수 없습니다. 파일 구조를 확인해주세요.")
-    except Exception as e:
-        raise Exception(f"파일 열기/파싱 중 오류 발생: {e}")
+        database = hyperscan.Database()
+        database.compile(expressions=[re.escape(template_bytes)], ids=[0],
+                         flags=[hyperscan.HS_FLAG_SINGLEMATCH])
+        return database
+    except hyperscan.error:
+        return None
+
+def make_template_matcher(template):
+    """
+    페이지(요소)에 template 문자열이 포함되어 있는지 검사하는 함수 has_template(page)를 만들어 반환합니다.
+    HWPX에서는 한 문장이 여러 텍스트 run(<hp:t>)으로 나뉘어 저장될 수 있으므로,
+    텍스트 노드를 하나씩 검사하지 않고 페이지 전체 텍스트(page_text_bytes)에서 검색합니다.
+    Hyperscan이 설치되어 있으면 실행마다 한 번 컴파일한 데이터베이스로, 없으면 미리 컴파일한 bytes 정규식으로 검색합니다.
+    """
+    template_bytes = template.encode('utf-8')
+    database = compile_hyperscan_template(template_bytes)
 
-def split_by_template(tree, template, skip_pages):
+    if database is not None:
+        def stop_scan(*_):
+            return True  # 첫 일치에서 검색을 멈춥니다. (ScanTerminated 발생)
+
+        def has_template(page):
+            try:
+                database.scan(page_text_bytes(page), match_event_handler=stop_scan)
+            except hyperscan.ScanTerminated:
+                return True
+            return False
+    else:
+        # 실행마다 고정된 template을 리터럴 bytes 패턴으로 한 번만 컴파일해 둡니다.
+        search = re.compile(re.escape(template_bytes)).search
+
+        def has_template(page):
+            return search(page_text_bytes(page)) is not None
+
+    return has_template
+
+def split_by_template(xml_file, template, skip_pages):
     """
-    XML 트리의 자식 요소들을 페이지로 간주하고,
+    XML을 스트리밍으로 읽으며 루트의 자식 요소들을 페이지로 간주하고,
     첫 skip_pages 만큼은 무시한 후, 각 페이지의 텍스트에 template 문자열이 나타나면
     새로운 구간의 시작으로 판단하여 분리합니다.
+    구간에 속하는 페이지는 원본 루트와 같은 태그/속성/네임스페이스를 가진 구간 루트로 옮기고(deep copy 없음),
+    구간이 끝날 때마다 구간 루트를 한 번에 XML bytes로 직렬화합니다.
+    구간에 속하지 않는 페이지는 읽는 즉시 트리에서 제거하여 메모리를 아낍니다.
+    구간별 XML 내용(bytes) 목록을 반환합니다.
     """
-    root = tree.getroot()
-    pages = list(root)
-    pages = pages[skip_pages:]  # 첫 skip_pages 페이지 무시
-
     sections = []
-    current_section = []
-
-    for page in pages:
-        page_text = ''.join(page.itertext())
-        if template in page_text:
-            if current_section:
-                sections.append(current_section)
+    section_root = None
+    has_template = make_template_matcher(template)
+
+    for index, page in enumerate(iter_pages(xml_file)):
+        root = page.getparent()
+        if index >= skip_pages and has_template(page):  # 첫 skip_pages 페이지 무시
+            if section_root is not None:
+                sections.append(ET.tostring(section_root, xml_declaration=True, encoding='utf-8'))
             # template이 포함된 페이지도 새 구간의 시작에 포함
-            current_section = [page]
+            section_root = ET.Element(root.tag, root.attrib, nsmap=root.nsmap)
+        if index >= skip_pages and section_root is not None:
+            # 구간 루트가 같은 네임스페이스를 선언하므로 페이지마다 xmlns 선언이 반복되지 않습니다.
+            section_root.append(page)
         else:
-            if current_section:
-                current_section.append(page)
-    if current_section:
-        sections.append(current_section)
+            page.clear()
+            root.remove(page)
+    if section_root is not None:
+        sections.append(ET.tostring(section_root, xml_declaration=True, encoding='utf-8'))
     return sections
 
-def create_section_tree(original_tree, section_pages):
+def root_tag_bytes(root):
     """
-    원본 트리의 루트 속성을 유지하며, 분리된 해당 구간(section_pages)만 deep copy하여 새로운 XML 트리를 생성합니다.
+    루트 요소의 여는 태그(XML 선언 포함)와 닫는 태그를 bytes로 반환합니다.
+    속성과 네임스페이스 선언의 이스케이프는 lxml이 한 번만 처리합니다.
     """
-    root = original_tree.getroot()
-    new_root = ET.Element(root.tag, root.attrib)
-    for page in section_pages:
-        new_root.append(copy.deepcopy(page))
-    return ET.ElementTree(new_root)
+    shell = ET.Element(root.tag, root.attrib, nsmap=root.nsmap)
+    shell.text = ''  # 빈 요소도 <tag></tag> 형태로 직렬화되도록 합니다.
+    xml_bytes = ET.tostring(shell, xml_declaration=True, encoding='utf-8')
+    close_pos = xml_bytes.rindex(b'</')
+    return xml_bytes[:close_pos], xml_bytes[close_pos:]
 
-def create_section_hwpx(original_file, section_tree, xml_path, output_file):
+def raw_member_offset(zin, item):
     """
-    원본 HWPX 파일의 전체 구조(이미지, 표, 폰트 등)를 그대로 복사하고,
-    지정된 xml_path(주 내용 XML 파일)를 새 구간 XML 내용으로 대체하여 새로운 HWPX 파일을 생성합니다.
+    ZIP 구성 파일(item)의 압축된 데이터가 시작되는 파일 내 위치를 반환합니다.
+    로컬 파일 헤더를 직접 해석하여 파일 이름과 extra 필드 뒤의 위치를 계산합니다.
     """
-    with zipfile.ZipFile(original_file, 'r') as zin:
-        with zipfile.ZipFile(output_file, 'w') as zout:
-            for item in zin.infolist():
+    zin.fp.seek(item.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, zin.fp.read(zipfile.sizeFileHeader))
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"'{item.filename}'의 로컬 파일 헤더가 올바르지 않습니다.")
+    name_length, extra_length = header[10], header[11]
+    return item.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+
+def map_hwpx_file(file_path):
+    """
+    원본 HWPX 파일을 읽기 전용 mmap으로 열어 반환합니다.
+    여러 구간을 저장하는 동안 같은 매핑을 재사용합니다.
+    """
+    with open(file_path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def iter_raw_member(source, item, data_offset):
+    """
+    mmap으로 연 원본 파일(source)에서 item의 압축된 데이터를 압축 해제 없이
+    COPY_CHUNK_SIZE 단위의 memoryview 조각으로 돌려줍니다. (복사 없이 매핑된 메모리를 그대로 참조)
+    각 조각은 다음 조각으로 넘어가거나 생성기가 닫힐 때 해제되므로, 호출하는 쪽은 contextlib.closing으로
+    생성기를 닫아 오류가 나도 mmap을 닫을 수 있게 해야 합니다.
+    """
+    end = data_offset + item.compress_size
+    if end > len(source):
+        raise zipfile.BadZipFile(f"'{item.filename}'의 데이터가 잘려 있습니다.")
+    with memoryview(source) as view:
+        for start in range(data_offset, end, COPY_CHUNK_SIZE):
+            with view[start:min(start + COPY_CHUNK_SIZE, end)] as chunk:
+                yield chunk
+
+def write_raw_member(zout, item, raw_chunks):
+    """
+    압축된 데이터 조각(raw_chunks)을 다시 압축하지 않고 zout에 그대로 기록합니다.
+    CRC와 크기는 원본 ZipInfo의 값을 사용하여 로컬 헤더와 중앙 디렉터리에 기록합니다.
+    """
+    zinfo = copy.copy(item)
+    zinfo.flag_bits &= ~0x08  # 크기를 로컬 헤더에 바로 기록하므로 data descriptor는 쓰지 않습니다.
+    if zout.fp.tell() != zout.start_dir:
+        # seek는 쓰기 버퍼를 비우므로 위치가 다를 때만 호출합니다.
+        zout.fp.seek(zout.start_dir)
+    zinfo.header_offset = zout.fp.tell()
+    zout.fp.write(zinfo.FileHeader())
+    for chunk in raw_chunks:
+        zout.fp.write(chunk)
+    zout.start_dir = zout.fp.tell()
+    zout.filelist.append(zinfo)
+    zout.NameToInfo[zinfo.filename] = zinfo
+    zout._didModify = True
+
+def write_deflated_member(zout, zinfo, data, compresslevel):
+    """
+    libdeflate(deflate 패키지)로 data를 raw deflate 압축하여 zout에 기록합니다.
+    CRC도 libdeflate로 계산하며, 기록은 write_raw_member를 사용합니다.
+    """
+    raw_data = deflate.deflate_compress(data, compresslevel)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = len(data)
+    zinfo.compress_size = len(raw_data)
+    zinfo.CRC = deflate.crc32(data)
+    write_raw_member(zout, zinfo, [raw_data])
+
+def load_hwpx_members(source, xml_path):
+    """
+    원본 HWPX 파일(source, map_hwpx_file로 연 mmap)의 모든 구성 파일을
+    원래 순서대로 (ZipInfo, 압축된 데이터 위치) 목록으로 한 번만 읽어 둡니다.
+    이미지, 폰트 등은 압축을 풀지 않고 저장할 때 원본 파일에서 그대로 복사합니다.
+    구간마다 대체될 xml_path의 위치는 None으로 둡니다.
+    """
+    with zipfile.ZipFile(source, 'r') as zin:
+        return [
+            (item, None if item.filename == xml_path else raw_member_offset(zin, item))
+            for item in zin.infolist()
+        ]
+
+def write_xml_member(zout, zinfo, xml_parts, compresslevel):
+    """
+    XML 내용 조각(xml_parts)을 zipfile(zlib)의 deflate 스트림에 순서대로 기록합니다.
+    전체 XML을 하나의 bytes로 합치는 중간 복사가 생기지 않습니다.
+    xml_parts는 리스트뿐 아니라 조각을 차례로 만들어 내는 생성기여도 됩니다.
+    """
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo._compresslevel = compresslevel  # zout.open(..., 'w')에서 사용하는 압축 수준
+    if isinstance(xml_parts, list):
+        zinfo.file_size = sum(len(part) for part in xml_parts)  # ZIP64 필요 여부 판단에 사용
+    with zout.open(zinfo, 'w') as dst:
+        for part in xml_parts:
+            dst.write(part)
+
+def create_section_hwpx(source, members, xml_parts, xml_path, output_file, compresslevel=DEFAULT_COMPRESSLEVEL):
+    """
+    load_hwpx_members로 읽어 둔 원본 HWPX 파일(source, map_hwpx_file로 연 mmap)의 전체 구조(이미지, 표, 폰트 등)를 재압축 없이 그대로 복사하고,
+    지정된 xml_path(주 내용 XML 파일)를 새 구간 XML 내용(xml_parts, bytes 조각 목록 또는 생성기)으로 대체하여 새로운 HWPX 파일을 생성합니다.
+    새로 압축되는 것은 XML 하나뿐이며, compresslevel로 그 deflate 압축 수준을 지정합니다.
+    deflate 패키지(libdeflate)가 있으면 이를 사용하고, 없으면 zipfile(zlib)로 압축합니다.
+    xml_parts가 생성기이면 메모리에 모으지 않도록 항상 zipfile 스트림으로 기록합니다.
+    """
+    # 출력 파일이 원본(mmap으로 열려 있을 수 있음)과 같은 파일이어도 원본이 잘리지 않도록
+    # 임시 파일에 먼저 기록한 뒤 os.replace로 교체합니다.
+    temp_file = output_file + '.tmp'
+    try:
+        with open(temp_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f, zipfile.ZipFile(f, 'w') as zout:
+            for item, data_offset in members:
                 if item.filename == xml_path:
-                    xml_bytes = ET.tostring(section_tree.getroot(), encoding="utf-8", method="xml")
-                    xml_content = b'<?xml version="1.0" encoding="utf-8"?>\n' + xml_bytes
-                    zout.writestr(item, xml_content)
+                    xml_info = zipfile.ZipInfo(xml_path, date_time=item.date_time)
+                    # 원본 구성 파일의 속성(파일 권한 등)과 생성 시스템 정보를 그대로 유지합니다.
+                    xml_info.external_attr = item.external_attr
+                    xml_info.create_system = item.create_system
+                    if deflate is not None and isinstance(xml_parts, list):
+                        # libdeflate는 한 번에 압축하므로 연속된 bytes가 필요합니다.
+                        write_deflated_member(zout, xml_info, b''.join(xml_parts), compresslevel)
+                    else:
+                        write_xml_member(zout, xml_info, xml_parts, compresslevel)
                 else:
-                    file_data = zin.read(item.filename)
-                    zout.writestr(item, file_data)
-
-def process_file(input_file, output_dir, template, skip_pages, log_callback):
+                    with contextlib.closing(iter_raw_member(source, item, data_offset)) as raw_chunks:
+                        write_raw_member(zout, item, raw_chunks)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+# 작업 프로세스마다 원본 파일 매핑과 구성을 한 번만 읽어 두기 위한 캐시 ((input_file, xml_path), source, members)
+_worker_source = (None, None, None)
+
+def write_section(input_file, xml_path, xml_parts, output_file, compresslevel):
+    """
+    프로세스 풀 작업 함수: 구간 하나를 HWPX 파일로 저장합니다.
+    원본 파일 매핑(map_hwpx_file)과 구성(load_hwpx_members)은 작업 프로세스마다 처음 한 번만 만들고 이후 구간에서 재사용합니다.
+    """
+    global _worker_source
+    key, source, members = _worker_source
+    if key != (input_file, xml_path):
+        if source is not None:
+            source.close()
+        source = map_hwpx_file(input_file)
+        members = load_hwpx_members(source, xml_path)
+        _worker_source = ((input_file, xml_path), source, members)
+    create_section_hwpx(source, members, xml_parts, xml_path, output_file, compresslevel)
+
+def process_file(input_file, output_dir, template, skip_pages, log_callback, compresslevel=DEFAULT_COMPRESSLEVEL):
     """
     설정값에 따라 HWPX 파일을 분리 처리합니다.
     진행 사항은 log_callback 함수를 통해 전달합니다.
+    compresslevel은 각 구간 XML의 deflate 압축 수준입니다.
     """
     try:
         log_callback("XML 파일 추출 중...")
-        tree, xml_path = extract_hwpx_xml(input_file)
-    except Exception as e:
-        log_callback(str(e))
-        return
-
-    try:
-        log_callback("분리 기준에 따라 페이지 분리 중...")
-        sections = split_by_template(tree, template, skip_pages)
+        with open_hwpx_xml(input_file) as (xml_file, xml_path):
+            try:
+                log_callback("분리 기준에 따라 페이지 분리 중...")
+                sections = split_by_template(xml_file, template, skip_pages)
+            except Exception as e:
+                log_callback(f"페이지 분리 중 오류 발생: {e}")
+                return
     except Exception as e:
-        log_callback(f"페이지 분리 중 오류 발생: {e}")
+        log_callback(f"파일 열기/파싱 중 오류 발생: {e}")
         return
 
     if not sections:
@@ -102,68 +339,202 @@ def process_file(input_file, output_dir, template, skip_pages, log_callback):
     os.makedirs(output_dir, exist_ok=True)
     log_callback(f"총 {len(sections)}개의 구간이 발견되었습니다.")
 
-    for i, section_pages in enumerate(sections, start=1):
-        log_callback(f"구간 {i}번 처리 중...")
-        section_tree = create_section_tree(tree, section_pages)
-        output_file = os.path.join(output_dir, f'section_{i}.hwpx')
+    jobs = [(i, os.path.join(output_dir, f'section_{i}.hwpx'), [section_xml])
+            for i, section_xml in enumerate(sections, start=1)]
+
+    if len(sections) == 1 or sum(len(section_xml) for section_xml in sections) < PARALLEL_MIN_XML_SIZE:
+        # 작은 작업은 작업 프로세스를 띄우는 비용이 저장 시간보다 크므로 현재 스레드에서 차례로 저장합니다.
+        with map_hwpx_file(input_file) as source:
+            members = load_hwpx_members(source, xml_path)
+            for i, output_file, xml_parts in jobs:
+                try:
+                    create_section_hwpx(source, members, xml_parts, xml_path, output_file, compresslevel)
+                    log_callback(f"구간 {i}번이 '{output_file}' 파일로 저장되었습니다.")
+                except Exception as e:
+                    log_callback(f"구간 {i}번 저장 중 오류 발생: {e}")
+        return
+
+    # 구간별 파일 저장(압축)은 서로 독립적이므로 프로세스 풀에서 병렬로 처리합니다.
+    max_workers = min(len(sections), os.cpu_count() or 1)
+    # process_file은 QThread에서 실행되므로, 여러 스레드가 있는 Qt 프로세스를 fork하지 않도록 spawn을 사용합니다.
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [(i, output_file, executor.submit(write_section, input_file, xml_path, xml_parts, output_file, compresslevel))
+                   for i, output_file, xml_parts in jobs]
+
+        for i, output_file, future in futures:
+            try:
+                future.result()
+                log_callback(f"구간 {i}번이 '{output_file}' 파일로 저장되었습니다.")
+            except Exception as e:
+                log_callback(f"구간 {i}번 저장 중 오류 발생: {e}")
+
+def iter_merged_pages(files, base_nsmap, log_callback):
+    """
+    files의 각 파일에서 루트의 자식 요소(페이지)들을 스트리밍으로 읽어 직렬화된 bytes로 차례로 돌려줍니다.
+    파일의 네임스페이스 선언이 기본 파일(base_nsmap)과 같으면 페이지를 같은 선언을 가진 빈 루트로 옮겨 직렬화한 뒤
+    루트 태그만 떼어 내므로 페이지마다 xmlns 선언이 반복되지 않습니다. 다르면 페이지마다 필요한 선언을 포함하여 직렬화합니다.
+    한 파일의 페이지는 파일을 끝까지 읽은 뒤에 내보내므로, 읽기에 실패한 파일의 페이지는 포함되지 않습니다.
+    메모리에는 한 파일 분량의 직렬화된 페이지만 머무릅니다.
+    """
+    for file in files:
+        log_callback(f"{file} 파일에서 페이지 추출 중...")
+        file_pages = []
         try:
-            create_section_hwpx(input_file, section_tree, xml_path, output_file)
-            log_callback(f"구간 {i}번이 '{output_file}' 파일로 저장되었습니다.")
+            with open_hwpx_xml(file) as (xml_file, _):
+                shell = None
+                for page in iter_pages(xml_file):
+                    root = page.getparent()
+                    if root.nsmap != base_nsmap:
+                        file_pages.append(ET.tostring(page, encoding='utf-8'))
+                        page.clear()
+                        root.remove(page)
+                        continue
+                    if shell is None:
+                        shell = ET.Element(root.tag, nsmap=root.nsmap)
+                    shell.append(page)  # 원본 트리에서 옮겨지므로 읽은 페이지가 쌓이지 않습니다.
+                    xml_bytes = ET.tostring(shell, encoding='utf-8')
+                    # 빈 루트의 여는 태그에는 xmlns 선언만 있으므로 첫 '>'가 여는 태그의 끝입니다.
+                    file_pages.append(xml_bytes[xml_bytes.index(b'>') + 1:xml_bytes.rindex(b'</')])
+                    shell.remove(page)
         except Exception as e:
-            log_callback(f"구간 {i}번 저장 중 오류 발생: {e}")
+            log_callback(f"{file} 파일에서 XML 추출 실패: {e}")
+            continue
+        yield from file_pages
 
 def merge_hwpx_files(input_folder, output_folder, log_callback):
     """
     선택한 폴더 내의 모든 HWPX/hwtx 파일을 하나의 파일로 병합합니다.
-    각 파일에서 'Contents/section0.xml'을 추출하여 모든 페이지를 순서대로 합친 후,
-    기본 파일의 구조를 복사하여 새로운 HWPX 파일을 생성합니다.
-    """
-    # 입력 폴더에서 HWPX/hwtx 파일 찾기
-    files = []
-    for file in os.listdir(input_folder):
-        if file.lower().endswith(('.hwpx', '.hwtx')):
-            files.append(os.path.join(input_folder, file))
+    기본 파일의 구조를 복사하여 새로운 HWPX 파일을 만들면서, 각 파일의 'Contents/section0.xml'에서
+    추출한 모든 페이지를 순서대로 출력 파일에 바로 기록합니다.
+    """
+    output_file = os.path.join(output_folder, "merged.hwpx")
+
+    # 입력 폴더에서 HWPX/hwtx 파일 찾기 (출력 폴더가 같으면 이전에 만든 병합 파일은 제외)
+    with os.scandir(input_folder) as entries:
+        files = [entry.path for entry in entries
+                 if entry.is_file() and entry.name.lower().endswith(('.hwpx', '.hwtx'))
+                 and not (os.path.exists(output_file) and os.path.samefile(entry.path, output_file))]
     if not files:
         log_callback("선택된 폴더에서 HWPX/hwtx 파일을 찾지 못했습니다.")
         return
     files.sort()
     log_callback(f"총 {len(files)}개의 파일을 병합합니다.")
 
+    # 기본 파일(첫 번째 파일)의 루트 요소(태그, 속성, 네임스페이스)는 한 번만 읽어 둡니다.
     try:
-        base_tree, xml_path = extract_hwpx_xml(files[0])
+        with open_hwpx_xml(files[0]) as (xml_file, xml_path):
+            base_root = read_root_element(xml_file)
     except Exception as e:
         log_callback(f"기본 파일의 XML 추출에 실패했습니다: {e}")
         return
 
-    merged_pages = []
-    for file in files:
-        log_callback(f"{file} 파일에서 페이지 추출 중...")
-        try:
-            tree, _ = extract_hwpx_xml(file)
-            root = tree.getroot()
-            pages = list(root)
-            merged_pages.extend(copy.deepcopy(pages))
-        except Exception as e:
-            log_callback(f"{file} 파일에서 XML 추출 실패: {e}")
-
-    # 기본 파일의 루트 속성을 이용하여 새로운 XML 트리 생성
-    new_root = ET.Element(base_tree.getroot().tag, base_tree.getroot().attrib)
-    for page in merged_pages:
-        new_root.append(page)
-    merged_tree = ET.ElementTree(new_root)
-
     os.makedirs(output_folder, exist_ok=True)
-    output_file = os.path.join(output_folder, "merged.hwpx")
     try:
-        create_section_hwpx(files[0], merged_tree, xml_path, output_file)
+        # 기본 파일의 루트 속성을 이용하여 새로운 XML 내용을 만들되,
+        # 각 파일의 페이지는 읽는 대로 출력 파일의 XML 압축 스트림에 바로 기록합니다.
+        open_tag, close_tag = root_tag_bytes(base_root)
+        merged_pages = iter_merged_pages(files, base_root.nsmap, log_callback)
+        xml_parts = itertools.chain([open_tag], merged_pages, [close_tag])
+        with map_hwpx_file(files[0]) as source:
+            members = load_hwpx_members(source, xml_path)
+            create_section_hwpx(source, members, xml_parts, xml_path, output_file)
         log_callback(f"병합된 파일이 '{output_file}' 에 저장되었습니다.")
     except Exception as e:
         log_callback(f"병합 파일 생성 중 오류 발생: {e}")
 
+# =======================
+# GUI - 백그라운드 작업
+# =======================
+class TaskWorker(QtCore.QObject):
+    """
+    분리/병합 함수를 별도 QThread에서 실행하는 작업 객체입니다.
+    log_callback으로 전달되는 메시지는 log 시그널로 GUI 스레드에 전달됩니다.
+    """
+    log = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        try:
+            self.func(*self.args, log_callback=self.log.emit, **self.kwargs)
+        except Exception as e:
+            self.log.emit(f"처리 중 오류 발생: {e}")
+        finally:
+            self.finished.emit()
+
+class TaskTab(QtWidgets.QWidget):
+    """
+    무거운 작업을 QThread에서 실행하여 처리 중에도 창이 멈추지 않도록 하는 탭의 공통 부분입니다.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.task_thread = None
+        self.task_worker = None
+        # 로그 메시지는 모아 두었다가 LOG_FLUSH_INTERVAL_MS 간격으로 한 번에 로그 창에 추가합니다.
+        self.log_buffer = []
+        self.log_flush_timer = QtCore.QTimer(self)
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self.log_flush_timer.timeout.connect(self.flush_log)
+
+    def log(self, message):
+        self.log_buffer.append(message)
+        if not self.log_flush_timer.isActive():
+            self.log_flush_timer.start()
+
+    def flush_log(self):
+        """
+        모아 둔 로그 메시지를 로그 창 끝에 한 번에 추가하고 스크롤을 맨 아래로 이동합니다.
+        메시지마다 append하여 매번 레이아웃을 다시 계산하는 비용을 줄입니다.
+        """
+        if not self.log_buffer:
+            return
+        text = '\n'.join(self.log_buffer)
+        self.log_buffer.clear()
+        if not self.log_text.document().isEmpty():
+            text = '\n' + text
+        self.log_text.moveCursor(QtGui.QTextCursor.End)
+        self.log_text.insertPlainText(text)
+        self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
+
+    def run_task(self, run_button, func, *args, **kwargs):
+        """
+        func(*args, log_callback=..., **kwargs)를 백그라운드 스레드에서 실행합니다.
+        실행 중에는 run_button을 비활성화합니다.
+        """
+        run_button.setEnabled(False)
+        self.task_thread = QtCore.QThread()
+        self.task_worker = TaskWorker(func, *args, **kwargs)
+        self.task_worker.moveToThread(self.task_thread)
+        # 작업 스레드에서 보낸 로그는 queued connection으로 GUI 스레드에서 처리됩니다.
+        self.task_worker.log.connect(self.log)
+        self.task_thread.started.connect(self.task_worker.run)
+        self.task_worker.finished.connect(self.task_thread.quit)
+        self.task_thread.finished.connect(lambda: self.task_finished(run_button))
+        self.task_thread.start()
+
+    def task_finished(self, run_button):
+        self.task_thread.wait()  # 스레드가 완전히 끝난 뒤에 QThread 객체를 해제합니다.
+        self.task_thread = None
+        self.task_worker = None
+        run_button.setEnabled(True)
+
+    def wait_for_task(self):
+        """실행 중인 작업이 있으면 끝날 때까지 기다립니다. (창을 닫을 때 사용)"""
+        if self.task_thread is not None:
+            self.task_thread.wait()
+
 # =======================
 # GUI - 분리하기 탭
 # =======================
-class SplitTab(QtWidgets.QWidget):
+class SplitTab(TaskTab):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
@@ -203,6 +574,10 @@ class SplitTab(QtWidgets.QWidget):
         setting_layout.addSpacing(20)
         setting_layout.addWidget(QtWidgets.QLabel("첫 페이지 무시 수:"))
         setting_layout.addWidget(self.skip_spin)
+        setting_layout.addSpacing(20)
+        self.fast_compress_check = QtWidgets.QCheckBox("빠른 압축")
+        self.fast_compress_check.setToolTip("구간 XML을 낮은 압축 수준으로 저장하여 속도를 높입니다. 파일 크기는 조금 커질 수 있습니다.")
+        setting_layout.addWidget(self.fast_compress_check)
         layout.addLayout(setting_layout)
 
         # 실행 버튼
@@ -216,10 +591,6 @@ class SplitTab(QtWidgets.QWidget):
         layout.addWidget(QtWidgets.QLabel("진행 로그:"))
         layout.addWidget(self.log_text)
 
-    def log(self, message):
-        self.log_text.append(message)
-        self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
-
     def browse_file(self):
         file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
             self, "HWPX/hwtx 파일 선택", "", "HWPX Files (*.hwpx *.hwtx);;All Files (*)"
@@ -237,6 +608,7 @@ class SplitTab(QtWidgets.QWidget):
         output_dir = self.output_line.text().strip()
         template = self.template_line.text().strip()
         skip_pages = self.skip_spin.value()
+        compresslevel = FAST_COMPRESSLEVEL if self.fast_compress_check.isChecked() else DEFAULT_COMPRESSLEVEL
 
         if not input_file or not os.path.isfile(input_file):
             self.log("유효한 입력 파일을 선택해주세요.")
@@ -247,12 +619,13 @@ class SplitTab(QtWidgets.QWidget):
             return
 
         self.log("분리 처리를 시작합니다...")
-        QtCore.QTimer.singleShot(100, lambda: process_file(input_file, output_dir, template, skip_pages, self.log))
+        self.run_task(self.start_btn, process_file, input_file, output_dir, template, skip_pages,
+                      compresslevel=compresslevel)
 
 # =======================
 # GUI - 합치기 탭
 # =======================
-class MergeTab(QtWidgets.QWidget):
+class MergeTab(TaskTab):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
@@ -292,10 +665,6 @@ class MergeTab(QtWidgets.QWidget):
         layout.addWidget(QtWidgets.QLabel("진행 로그:"))
         layout.addWidget(self.log_text)
 
-    def log(self, message):
-        self.log_text.append(message)
-        self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
-
     def select_input_folder(self):
         folder = QtWidgets.QFileDialog.getExistingDirectory(self, "합칠 파일이 있는 폴더 선택", "")
         if folder:
@@ -319,7 +688,7 @@ class MergeTab(QtWidgets.QWidget):
             return
 
         self.log("병합 처리를 시작합니다...")
-        QtCore.QTimer.singleShot(100, lambda: merge_hwpx_files(input_folder, output_folder, self.log))
+        self.run_task(self.merge_btn, merge_hwpx_files, input_folder, output_folder)
 
 # =======================
 # 메인 윈도우 (탭 구성)
@@ -341,7 +710,14 @@ class MainWindow(QtWidgets.QMainWindow):
         tabs.addTab(self.split_tab, "분리하기")
         tabs.addTab(self.merge_tab, "합치기")
 
+    def closeEvent(self, event):
+        # 작업 스레드가 실행 중인 채로 종료되지 않도록 남은 작업을 기다립니다.
+        self.split_tab.wait_for_task()
+        self.merge_tab.wait_for_task()
+        super().closeEvent(event)
+
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # PyInstaller 등으로 묶은 실행 파일에서 프로세스 풀을 사용하기 위해 필요
     app = QtWidgets.QApplication(sys.argv)
     main_win = MainWindow()
     main_win.show()